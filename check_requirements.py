@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+依赖检查脚本
+只读取已安装包的元数据，不导入任何模块；依赖齐全时退出码为0，否则为1
+"""
+
+import re
+import sys
+from importlib.metadata import distributions
+
+
+def normalize_name(name):
+    """按PEP 503规范化包名"""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def main(requirements_file='requirements.txt'):
+    """检查requirements文件中的包是否都已安装"""
+    installed = {normalize_name(dist.metadata['Name'] or '') for dist in distributions()}
+    # 标准库模块（如pathlib）不会出现在已安装包列表中
+    stdlib_names = getattr(sys, 'stdlib_module_names', ())
+
+    with open(requirements_file, encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            name = normalize_name(re.split(r'[<>=!~;\[\s]', line, 1)[0])
+            if name not in installed and name not in stdlib_names:
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -8,24 +8,421 @@ Image-tools 通用图片下载器
 import os
 import sys
 import json
+import importlib.util
+import hashlib
 import requests
-from urllib.parse import urljoin, urlparse
+from requests.adapters import HTTPAdapter
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
 from pathlib import Path
 import time
+import threading
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
 import re
+import html
+import random
 from urllib.request import urlopen
 from urllib.error import HTTPError, URLError
 
+# 优先使用C实现的lxml解析器，未安装时回退到内置的html.parser
+try:
+    import lxml
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# 只有安装了brotli时requests才能解压br编码的响应，未安装时不声明br
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# 安装了orjson时用它读写JSON文件，否则回退到标准库json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_loads(data):
+    """解析JSON字节串"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj):
+    """序列化为带缩进的UTF-8 JSON字节串"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+# 快速提取模式使用的正则：直接扫描HTML文本，不构建DOM树
+_IMG_TAG_RE = re.compile(rb'<img\b[^>]*?\s(?:src|data-src|data-lazy-src)\s*=\s*["\']([^"\']+)', re.I)
+_STYLE_ATTR_RE = re.compile(rb'\sstyle\s*=\s*(["\'])(.*?)\1', re.I | re.S)
+_BG_STYLE_RE = re.compile(r'background.*?url')
+_CSS_URL_RE = re.compile(r'url\(["\']?(.*?)["\']?\)')
+
+# 图片URL路径的有效扩展名和常见关键词，合成一个不区分大小写的正则，一次扫描完成校验
+_IMAGE_URL_PATH_RE = re.compile(r'\.(?:jpe?g|png|gif|webp|bmp)\Z|img|image|photo|pic|thumb|banner', re.I)
+
+# 文件名中的长数字ID（通常出现在产品图中）
+_LONG_NUMBER_RE = re.compile(r'\d{10,}')
+
+# 请求头和地理位置服务等固定数据，在导入时构建一次
+_USER_AGENTS = (
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2.1 Safari/605.1.15',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:122.0) Gecko/20100101 Firefox/122.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:122.0) Gecko/20100101 Firefox/122.0',
+)
+
+_ACCEPT_LANGUAGES = (
+    'zh-CN,zh;q=0.9,en;q=0.8',
+    'en-US,en;q=0.9,zh-CN;q=0.8,zh;q=0.7',
+    'zh-CN,zh;q=0.8,zh-TW;q=0.7,zh-HK;q=0.5,en-US;q=0.3,en;q=0.2',
+)
+
+# 图片下载专用的请求头
+_IMAGE_REQUEST_HEADERS = {
+    'Accept': 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
+    'Sec-Fetch-Dest': 'image',
+    'Sec-Fetch-Mode': 'no-cors',
+    'Sec-Fetch-Site': 'same-origin',
+    # 图片本身已是压缩格式，要求服务器原样传输，省去传输编码的解压开销
+    'Accept-Encoding': 'identity',
+}
+
+# 不影响图片内容的跟踪参数（utm_*另按前缀过滤）
+_TRACKING_PARAMS = frozenset(('ref', 'fbclid', 'gclid'))
+
+# 会话连接池大小：缓存的主机数和每个主机保持的keep-alive连接数
+_POOL_CONNECTIONS = 32
+_POOL_MAXSIZE = 64
+
+# 下载图片时每次从响应读取并写入文件的字节数
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+# 常见图片格式的文件头：JPEG、PNG、GIF、WEBP(RIFF)、BMP
+_IMAGE_MAGIC_NUMBERS = (b'\xff\xd8', b'\x89PNG\r\n\x1a\n', b'GIF8', b'RIFF', b'BM')
+
+# 文件大小显示单位
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+# Gemini请求遇到频率限制时的最大尝试次数和退避上限（秒）
+_GEMINI_MAX_ATTEMPTS = 5
+_GEMINI_MAX_BACKOFF = 60
+
+# 使用的Gemini模型
+_GEMINI_MODEL_NAME = 'gemini-2.5-flash-preview-05-20'
+
+# 分析结果缓存的格式版本，缓存结构变化时递增
+_GEMINI_CACHE_VERSION = 1
+
+# 发送给Gemini前图片长边的最大像素数，分类识别不需要原始分辨率
+_GEMINI_MAX_IMAGE_SIDE = 768
+
+# Gemini重命名模式处理的图片扩展名
+_GEMINI_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.svg')
+
+# Gemini图片分析提示词
+_GEMINI_ANALYSIS_PROMPT = """
+请分析这张网站图片，并识别以下信息：
+
+1. 图片类型：
+   - hero/banner: 大幅宣传图、英雄图、横幅
+   - product: 产品图、商品图
+   - detail: 细节图、特写图
+   - icon: 小图标、按钮图标
+   - news: 新闻图片、文章图片
+   - team: 团队照片、人物照片
+   - gallery: 画廊图片、展示图片
+   - background: 背景图
+
+2. 内容特征：
+   - 主要产品或服务的特征
+   - 品牌元素和视觉风格
+   - 图片的主要用途和功能
+
+3. 图片质量和用途：
+   - main: 高质量主图
+   - thumb: 缩略图
+   - detail: 详情图
+   - icon: 图标
+
+请用JSON格式回复：
+{
+    "type": "图片类型",
+    "content": "内容描述",
+    "quality": "图片质量",
+    "description": "简短描述",
+    "confidence": "置信度(1-10)"
+}"""
+
+# AI文件名生成用到的正则
+_DIGITS_RE = re.compile(r'(\d+)')
+_TWO_DIGITS_RE = re.compile(r'\d{2}')
+_UNDERSCORES_RE = re.compile(r'_+')
+_HYPHENS_RE = re.compile(r'-+')
+_CHINESE_RE = re.compile(r'[\u4e00-\u9fff]+')
+_WORD4_RE = re.compile(r'\b[a-zA-Z]{4,}\b')
+_WORD3_RE = re.compile(r'\b[a-zA-Z]{3}\b')
+_NON_FILENAME_CHARS_RE = re.compile(r'[^a-z0-9\-]')
+
+# AI分析字段的中文到英文翻译映射
+_FIELD_TRANSLATIONS = {
+    # 产品系列相关
+    '飞行员表': 'pilot',
+    '飞行': 'flight',
+    '陀飞轮': 'tourbillon',
+    '潜水表': 'dive',
+    '潜水': 'dive', 
+    '海洋': 'ocean',
+    '复古': 'retro',
+    '电视': 'tv',
+    '女表': 'women',
+    '女士': 'women',
+    '男表': 'men',
+    '男士': 'men',
+    '大师': 'master',
+    '工匠': 'craftsman',
+    '机械': 'mechanical',
+    '自动': 'automatic',
+    '石英': 'quartz',
+    
+    # 图片类型相关
+    '团队': 'team',
+    '新闻': 'news',
+    '背景': 'background',
+    '主图': 'main',
+    '缩略图': 'thumb',
+    '细节': 'detail',
+    '产品': 'product',
+    '英雄': 'hero',
+    '横幅': 'banner',
+    '图标': 'icon',
+    
+    # 质量和描述相关
+    '高清': 'hd',
+    '精美': 'fine',
+    '优质': 'quality',
+    '专业': 'professional',
+    '商务': 'business',
+    '运动': 'sport',
+    '休闲': 'casual',
+    '正装': 'formal',
+    '时尚': 'fashion',
+    '经典': 'classic',
+    '现代': 'modern',
+    '传统': 'traditional',
+    
+    # 材质相关
+    '精钢': 'steel',
+    '不锈钢': 'steel',
+    '黄金': 'gold',
+    '玫瑰金': 'rosegold',
+    '白金': 'platinum',
+    '钛合金': 'titanium',
+    '陶瓷': 'ceramic',
+    '皮革': 'leather',
+    '橡胶': 'rubber',
+    
+    # 常见词汇清理
+    '手表': 'watch',
+    '腕表': 'watch',
+    '时计': 'timepiece',
+    '表': '',  # 单独的"表"字移除
+    '款': '',  # "款"字移除
+    '型': '',  # "型"字移除
+    '级': '',  # "级"字移除
+}
+
+# 图片描述的中文到英文翻译映射
+_DESCRIPTION_TRANSLATIONS = {
+    '手表': 'watch',
+    '腕表': 'watch', 
+    '时计': 'timepiece',
+    '机芯': 'movement',
+    '表盘': 'dial',
+    '表带': 'strap',
+    '表链': 'bracelet',
+    '表冠': 'crown',
+    '指针': 'hands',
+    '刻度': 'marker',
+    '夜光': 'luminous',
+    '防水': 'waterproof',
+    '计时': 'chrono',
+    '日历': 'calendar',
+    '月相': 'moonphase',
+    '动力': 'power',
+    '储能': 'reserve',
+    '精钢': 'steel',
+    '黄金': 'gold',
+    '玫瑰金': 'rosegold',
+    '钛合金': 'titanium',
+    '陶瓷': 'ceramic',
+    '蓝宝石': 'sapphire',
+    '皮革': 'leather',
+    '橡胶': 'rubber',
+    '尼龙': 'nylon',
+    '男士': 'men',
+    '女士': 'women',
+    '运动': 'sport',
+    '商务': 'business',
+    '休闲': 'casual',
+    '正装': 'formal',
+    '复古': 'vintage',
+    '现代': 'modern',
+    '经典': 'classic',
+    '时尚': 'fashion',
+    '优雅': 'elegant',
+    '精致': 'refined',
+    '豪华': 'luxury',
+    '限量': 'limited',
+    '特别': 'special',
+    '纪念': 'commemorative'
+}
+
+# 描述中的优先级关键词映射（按重要性排序）
+_PRIORITY_KEYWORDS = {
+    # 高优先级 - 产品特征
+    'tourbillon': 'tourbillon',
+    'skeleton': 'skeleton', 
+    'chronograph': 'chrono',
+    'diving': 'dive',
+    'pilot': 'pilot',
+    'aviation': 'aviation',
+    'military': 'military',
+    'dress': 'dress',
+    'sport': 'sport',
+    
+    # 中优先级 - 材质和功能
+    'gold': 'gold',
+    'steel': 'steel',
+    'titanium': 'titanium',
+    'ceramic': 'ceramic',
+    'automatic': 'auto',
+    'mechanical': 'mech',
+    'quartz': 'quartz',
+    'solar': 'solar',
+    
+    # 低优先级 - 颜色和基本描述
+    'black': 'black',
+    'white': 'white', 
+    'blue': 'blue',
+    'brown': 'brown',
+    'silver': 'silver',
+    'rose': 'rose'
+}
+
+# 提取描述关键词时忽略的常见无意义词汇
+_DESCRIPTION_STOPWORDS = frozenset((
+    'this', 'that', 'with', 'from', 'have', 'been', 'they', 'were',
+    'said', 'each', 'which', 'their', 'time', 'will', 'about', 'image',
+    'picture', 'photo', 'showing', 'display', 'featuring', 'contains',
+))
+_DESCRIPTION_STOPWORDS_3 = frozenset((
+    'the', 'and', 'for', 'are', 'you', 'all', 'any', 'can', 'had', 'her', 'was', 'one', 'our', 'out',
+    'day', 'get', 'has', 'him', 'his', 'how', 'its', 'may', 'new', 'now', 'old', 'see', 'two', 'way',
+    'who', 'boy', 'did', 'end', 'few', 'man', 'men', 'put', 'say', 'she', 'too', 'use',
+))
+
+# 常见中文系列名的翻译映射
+_SERIES_TRANSLATIONS = {
+    '飞行': 'flight',
+    '陀飞轮': 'tourbillon', 
+    '潜水': 'dive',
+    '海洋': 'ocean',
+    '复古': 'retro',
+    '电视': 'tv',
+    '女表': 'women',
+    '大师': 'master',
+    '工匠': 'craftsman'
+}
+
+def _compile_translation_re(translations):
+    """把翻译映射的所有键合成一个正则，较长的键优先匹配，一次扫描完成全部替换"""
+    return re.compile('|'.join(map(re.escape, sorted(translations, key=len, reverse=True))))
+
+
+_FIELD_TRANSLATION_RE = _compile_translation_re(_FIELD_TRANSLATIONS)
+_DESCRIPTION_TRANSLATION_RE = _compile_translation_re(_DESCRIPTION_TRANSLATIONS)
+_SERIES_TRANSLATION_RE = _compile_translation_re(_SERIES_TRANSLATIONS)
+
+# 按优先级排列的地理位置查询服务
+_LOCATION_APIS = (
+    {'name': 'IPApi.co', 'url': 'https://ipapi.co/json/', 'timeout': 8},
+    {'name': 'IP-API.com', 'url': 'http://ip-api.com/json/', 'timeout': 6},
+    {'name': 'IPInfo.io', 'url': 'https://ipinfo.io/json', 'timeout': 8},
+    {'name': 'HTTPBin.org', 'url': 'https://httpbin.org/ip', 'timeout': 5},
+)
+
 # Gemini Vision API 相关导入
+# 启动时只检查模块是否存在，真正导入推迟到 --gemini 模式初始化时，
+# 避免其他模式也为加载 google.generativeai 和 PIL 付出启动开销
+genai = None
+Image = None
 try:
-    import google.generativeai as genai
-    from PIL import Image
-    GEMINI_AVAILABLE = True
+    GEMINI_AVAILABLE = (importlib.util.find_spec('google.generativeai') is not None
+                        and importlib.util.find_spec('PIL') is not None)
 except ImportError:
     GEMINI_AVAILABLE = False
+if not GEMINI_AVAILABLE:
     print("⚠️  Gemini Vision API 不可用，将使用基础匹配模式")
 
+
+def _canonical_url(url):
+    """规范化图片URL：统一主机名大小写，去掉锚点和跟踪参数，便于识别指向同一图片的不同写法"""
+    parts = urlsplit(url)
+    netloc = parts.netloc.lower()
+    if not parts.query and not parts.fragment and netloc == parts.netloc:
+        return url
+    # 直接按原始片段过滤，保留的参数不做重新编码
+    query = '&'.join(pair for pair in parts.query.split('&') if not _is_tracking_param(pair))
+    return urlunsplit((parts.scheme, netloc, parts.path, query, ''))
+
+
+def _is_tracking_param(pair):
+    """判断查询参数是否为不影响图片内容的跟踪参数"""
+    key = pair.split('=', 1)[0]
+    return key.startswith('utm_') or key in _TRACKING_PARAMS
+
+
+def _import_gemini_modules():
+    """按需导入 Gemini Vision 所需的模块"""
+    global genai, Image
+    import google.generativeai as genai
+    from PIL import Image
+
+
+class GeminiLocationError(Exception):
+    """当前地理位置不支持 Gemini API，后续请求都会失败"""
+
+
+def _is_gemini_rate_limited(error):
+    """判断Gemini错误是否为频率或配额限制（HTTP 429）"""
+    if getattr(error, 'code', None) == 429:
+        return True
+    error_msg = str(error).lower()
+    return any(text in error_msg for text in ('429', 'rate limit', 'quota', 'resource exhausted'))
+
+
+def _get_retry_after(error):
+    """读取错误响应中的Retry-After秒数，没有时返回None"""
+    response = getattr(error, 'response', None)
+    retry_after = getattr(response, 'headers', {}).get('Retry-After')
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        return None
+
+
 class ImageDownloader:
     def __init__(self, config_file='image_download_config.json'):
         """初始化下载器"""
@@ -34,6 +431,23 @@ class ImageDownloader:
         self.base_url = self.config.get('base_url', 'https://example.com/')
         self.images_dir = Path('./images')
         self.session = requests.Session()
+        # 挂载足够大的连接池，让同一主机的图片复用keep-alive连接；重试由download_image自行处理
+        adapter = HTTPAdapter(
+            pool_connections=_POOL_CONNECTIONS,
+            pool_maxsize=max(_POOL_MAXSIZE, self.max_concurrent_downloads),
+            max_retries=0,
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # 并发抓取页面时保护共享请求头的修改和请求的生成
+        self._headers_lock = threading.Lock()
+        # 每个主机一个信号量，限制同时向同一主机发起的下载数
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
+        # Gemini请求按固定间隔放行，控制每秒请求数；遇到地理位置限制后通知所有线程停止请求
+        self._gemini_rate_lock = threading.Lock()
+        self._gemini_next_request = 0.0
+        self._gemini_location_blocked = threading.Event()
         
         # 模式控制标志
         self.force_matching_mode = False
@@ -45,7 +459,7 @@ class ImageDownloader:
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8,en-GB;q=0.7,en-US;q=0.6',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': 'gzip, deflate, br' if BROTLI_AVAILABLE else 'gzip, deflate',
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
@@ -65,6 +479,27 @@ class ImageDownloader:
         # 创建images目录
         self.images_dir.mkdir(exist_ok=True)
         
+        # 预先读取已下载的非空文件名及大小，重复运行时直接跳过这些图片；--force 强制重新下载
+        self.force_download = '--force' in sys.argv
+        self._existing_files = {path.name: size for path, size in self._scan_image_files() if size > 0}
+        
+        # 加载下载缓存（文件名 → URL/ETag/Last-Modified/文件大小），用于跨运行的条件请求
+        self.download_cache_file = self.images_dir / '.download_cache.json'
+        self.download_cache = self._load_download_cache()
+        
+        # 图片URL列表缓存（按base_url区分），有效期内重复运行时跳过页面抓取
+        self.url_cache_file = Path('./.cache/url_index.json')
+        self.force_refresh = '--refresh' in sys.argv
+        
+        # 网页HTML缓存，配合ETag/Last-Modified条件请求，页面未修改时直接使用本地副本
+        self.page_cache_dir = Path('./.cache/pages')
+        self.use_page_cache = '--no-cache' not in sys.argv
+        
+        # Gemini分析结果缓存（图片内容哈希 → AI响应文本），重复运行时已分析过的图片不再调用API
+        self.gemini_cache_file = self.images_dir / '.gemini_cache.json'
+        self._gemini_cache = None
+        self._gemini_cache_lock = threading.Lock()
+        
         # 检查命令行参数，决定是否需要初始化 Gemini API
         self.need_gemini = len(sys.argv) > 1 and sys.argv[1] == '--gemini'
         
@@ -80,6 +515,14 @@ class ImageDownloader:
         if not GEMINI_AVAILABLE:
             self.gemini_model = None
             return
+        try:
+            _import_gemini_modules()
+        except ImportError as e:
+            # find_spec 只检查包是否存在，真正导入时仍可能因依赖缺失或损坏而失败
+            print(f"⚠️  Gemini Vision 模块导入失败，将使用基础匹配模式: {e}")
+            self.gemini_model = None
+            self.use_gemini_vision = False
+            return
         
         # 获取当前location信息
         print("🌍 检测当前地理位置和网络环境...")
@@ -102,7 +545,7 @@ class ImageDownloader:
             print("🔐 配置Gemini API密钥...")
             genai.configure(api_key=api_key)
             # 使用最新的 Gemini 2.5 Flash Preview 模型
-            self.gemini_model = genai.GenerativeModel('gemini-2.5-flash-preview-05-20')
+            self.gemini_model = genai.GenerativeModel(_GEMINI_MODEL_NAME)
             
             # 测试API连接
             print("🧪 测试Gemini API连接...")
@@ -160,78 +603,219 @@ class ImageDownloader:
     
     def _detect_location(self):
         """检测当前地理位置，使用多个备用API服务"""
-        location_apis = [
-            {
-                'name': 'IPApi.co',
-                'url': 'https://ipapi.co/json/',
-                'timeout': 8
-            },
-            {
-                'name': 'IP-API.com', 
-                'url': 'http://ip-api.com/json/',
-                'timeout': 6
-            },
-            {
-                'name': 'IPInfo.io',
-                'url': 'https://ipinfo.io/json',
-                'timeout': 8
-            },
-            {
-                'name': 'HTTPBin.org',
-                'url': 'https://httpbin.org/ip',
-                'timeout': 5
-            }
-        ]
-        
-        for api in location_apis:
-            try:
-                import requests
-                print(f"🔍 尝试通过 {api['name']} 获取地理位置...")
-                
-                response = requests.get(api['url'], timeout=api['timeout'])
-                if response.status_code == 200:
-                    location_data = response.json()
-                    
-                    if api['name'] == 'IPApi.co':
-                        print(f"📍 当前公网IP: {location_data.get('ip', '未知')}")
-                        print(f"🗺️  地理位置: {location_data.get('country_name', '未知')} - {location_data.get('city', '未知')}")
-                        print(f"🏢 ISP: {location_data.get('org', '未知')}")
-                        return
-                    elif api['name'] == 'IP-API.com':
-                        print(f"📍 当前公网IP: {location_data.get('query', '未知')}")
-                        print(f"🗺️  地理位置: {location_data.get('country', '未知')} - {location_data.get('city', '未知')}")
-                        print(f"🏢 ISP: {location_data.get('isp', '未知')}")
-                        return
-                    elif api['name'] == 'IPInfo.io':
-                        print(f"📍 当前公网IP: {location_data.get('ip', '未知')}")
-                        print(f"🗺️  地理位置: {location_data.get('country', '未知')} - {location_data.get('city', '未知')}")
-                        print(f"🏢 ISP: {location_data.get('org', '未知')}")
-                        return
-                    elif api['name'] == 'HTTPBin.org':
-                        print(f"📍 当前公网IP: {location_data.get('origin', '未知')}")
-                        print(f"🗺️  地理位置: 正在解析...")
-                        return
+        print(f"🔍 同时向 {len(_LOCATION_APIS)} 个服务查询地理位置...")
+        # 并发探测所有服务避免逐个等待超时，但按列表优先级取结果，
+        # 信息更完整的服务成功时优先采用（HTTPBin 只有IP，仅作兜底）
+        executor = ThreadPoolExecutor(max_workers=len(_LOCATION_APIS))
+        try:
+            futures = [
+                (api, executor.submit(requests.get, api['url'], timeout=api['timeout']))
+                for api in _LOCATION_APIS
+            ]
+            for api, future in futures:
+                try:
+                    response = future.result()
+                    if response.status_code == 200:
+                        location_data = response.json()
                         
-            except requests.exceptions.Timeout:
-                print(f"⏰ {api['name']} 响应超时，尝试下一个服务...")
-                continue
-            except requests.exceptions.ConnectionError:
-                print(f"🔌 {api['name']} 连接失败，尝试下一个服务...")
-                continue
-            except Exception as e:
-                print(f"⚠️  {api['name']} 获取失败: {e}")
-                continue
+                        if api['name'] == 'IPApi.co':
+                            print(f"📍 当前公网IP: {location_data.get('ip', '未知')}")
+                            print(f"🗺️  地理位置: {location_data.get('country_name', '未知')} - {location_data.get('city', '未知')}")
+                            print(f"🏢 ISP: {location_data.get('org', '未知')}")
+                            return
+                        elif api['name'] == 'IP-API.com':
+                            print(f"📍 当前公网IP: {location_data.get('query', '未知')}")
+                            print(f"🗺️  地理位置: {location_data.get('country', '未知')} - {location_data.get('city', '未知')}")
+                            print(f"🏢 ISP: {location_data.get('isp', '未知')}")
+                            return
+                        elif api['name'] == 'IPInfo.io':
+                            print(f"📍 当前公网IP: {location_data.get('ip', '未知')}")
+                            print(f"🗺️  地理位置: {location_data.get('country', '未知')} - {location_data.get('city', '未知')}")
+                            print(f"🏢 ISP: {location_data.get('org', '未知')}")
+                            return
+                        elif api['name'] == 'HTTPBin.org':
+                            print(f"📍 当前公网IP: {location_data.get('origin', '未知')}")
+                            print(f"🗺️  地理位置: 正在解析...")
+                            return
+                            
+                except requests.exceptions.Timeout:
+                    print(f"⏰ {api['name']} 响应超时")
+                except requests.exceptions.ConnectionError:
+                    print(f"🔌 {api['name']} 连接失败")
+                except Exception as e:
+                    print(f"⚠️  {api['name']} 获取失败: {e}")
+        finally:
+            # 已拿到结果时不再等待其余较慢的服务
+            executor.shutdown(wait=False)
         
         # 所有API都失败的情况
         print("⚠️  所有地理位置服务都无法访问")
         print("💡 这可能不会影响Gemini API的正常使用")
         print("🌐 如果Gemini API报错地理位置限制，请考虑使用VPN")
     
+    def _load_download_cache(self):
+        """加载下载缓存，文件不存在或损坏时返回空缓存"""
+        try:
+            with open(self.download_cache_file, 'rb') as f:
+                return _json_loads(f.read())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+    
+    def _save_download_cache(self):
+        """保存下载缓存"""
+        try:
+            with open(self.download_cache_file, 'wb') as f:
+                f.write(_json_dumps(self.download_cache))
+        except OSError as e:
+            print(f"⚠️  保存下载缓存失败: {e}")
+    
+    def _move_download_cache_entry(self, old_name, new_name):
+        """文件重命名后把下载缓存条目迁移到新文件名，避免残留过期条目"""
+        entry = self.download_cache.pop(old_name, None)
+        if entry is not None:
+            self.download_cache[new_name] = entry
+        else:
+            self.download_cache.pop(new_name, None)
+    
+    def _gemini_cache_tag(self):
+        """分析缓存的版本标识，模型或提示词变化后旧缓存自动失效"""
+        source = f"{_GEMINI_CACHE_VERSION}:{_GEMINI_MODEL_NAME}:{_GEMINI_ANALYSIS_PROMPT}"
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()
+    
+    def _load_gemini_cache(self):
+        """加载Gemini分析缓存，文件不存在、损坏或版本不符时返回空缓存"""
+        try:
+            cache = _json_loads(self.gemini_cache_file.read_bytes())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if not isinstance(cache, dict) or cache.get('tag') != self._gemini_cache_tag():
+            return {}
+        return cache.get('analyses', {})
+    
+    def _save_gemini_cache(self):
+        """保存Gemini分析缓存，先写临时文件再替换，避免中断时留下损坏的缓存"""
+        if self._gemini_cache is None:
+            return
+        with self._gemini_cache_lock:
+            data = _json_dumps({'tag': self._gemini_cache_tag(), 'analyses': self._gemini_cache})
+        try:
+            tmp_file = self.gemini_cache_file.with_suffix('.tmp')
+            tmp_file.write_bytes(data)
+            os.replace(tmp_file, self.gemini_cache_file)
+        except OSError as e:
+            print(f"⚠️  保存Gemini分析缓存失败: {e}")
+    
+    def _load_url_cache(self):
+        """读取图片URL缓存文件，文件不存在或损坏时返回空缓存"""
+        try:
+            return _json_loads(self.url_cache_file.read_bytes())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+    
+    def _url_cache_key(self):
+        """图片URL缓存的键，按base_url区分不同站点"""
+        return hashlib.sha1(self.base_url.encode('utf-8')).hexdigest()
+    
+    def _get_cached_image_urls(self):
+        """返回仍在有效期内的图片URL列表，未命中或要求刷新时返回None"""
+        if self.force_refresh or self.cache_ttl <= 0:
+            return None
+        entry = self._load_url_cache().get(self._url_cache_key())
+        if not entry or time.time() - entry.get('ts', 0) > self.cache_ttl:
+            return None
+        return entry.get('urls')
+    
+    def _save_cached_image_urls(self, image_urls):
+        """保存图片URL列表，先写临时文件再替换，避免中断时留下损坏的缓存"""
+        cache = self._load_url_cache()
+        cache[self._url_cache_key()] = {
+            'base_url': self.base_url,
+            'ts': time.time(),
+            'urls': image_urls,
+        }
+        try:
+            self.url_cache_file.parent.mkdir(exist_ok=True)
+            tmp_file = self.url_cache_file.with_suffix('.tmp')
+            tmp_file.write_bytes(_json_dumps(cache))
+            os.replace(tmp_file, self.url_cache_file)
+        except OSError as e:
+            print(f"⚠️  保存图片URL缓存失败: {e}")
+    
+    def _page_cache_paths(self, url):
+        """返回网页缓存的正文文件和元数据文件路径"""
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.page_cache_dir / f"{key}.html", self.page_cache_dir / f"{key}.json"
+    
+    def _get_page_conditional_headers(self, url):
+        """网页有本地缓存时，返回条件请求头以便服务器用304跳过传输"""
+        body_file, meta_file = self._page_cache_paths(url)
+        try:
+            meta = _json_loads(meta_file.read_bytes())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if not body_file.exists():
+            return {}
+        
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+    
+    def _load_cached_page(self, url):
+        """读取网页缓存的正文，缓存丢失时返回None"""
+        body_file, _ = self._page_cache_paths(url)
+        try:
+            return body_file.read_bytes()
+        except OSError:
+            return None
+    
+    def _save_cached_page(self, url, response):
+        """保存带校验头的网页正文，先写临时文件再替换，避免中断时留下损坏的缓存"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not self.use_page_cache or not (etag or last_modified):
+            return
+        
+        body_file, meta_file = self._page_cache_paths(url)
+        try:
+            self.page_cache_dir.mkdir(parents=True, exist_ok=True)
+            for path, data in ((body_file, response.content),
+                               (meta_file, _json_dumps({'url': url, 'etag': etag, 'last_modified': last_modified}))):
+                tmp_file = path.with_suffix(path.suffix + '.tmp')
+                tmp_file.write_bytes(data)
+                os.replace(tmp_file, path)
+        except OSError as e:
+            print(f"⚠️  保存网页缓存失败: {e}")
+    
+    def _get_conditional_headers(self, url, filename):
+        """本地文件与缓存记录一致时，返回条件请求头以便服务器用304跳过传输"""
+        cached = self.download_cache.get(filename)
+        if not cached or cached.get('url') != url:
+            return {}
+        
+        file_path = self.images_dir / filename
+        try:
+            if file_path.stat().st_size != cached.get('size'):
+                return {}
+        except FileNotFoundError:
+            return {}
+        
+        headers = {}
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+    
     def load_config(self):
         """加载配置文件"""
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
+            with open(self.config_file, 'rb') as f:
+                self.config = _json_loads(f.read())
+            self._load_settings()
+            self._compile_categories()
             print(f"✅ 已加载配置文件: {self.config_file}")
         except FileNotFoundError:
             print(f"❌ 配置文件 {self.config_file} 不存在，请先创建配置文件")
@@ -240,10 +824,62 @@ class ImageDownloader:
             print(f"❌ 配置文件 {self.config_file} 格式错误")
             sys.exit(1)
     
+    def _load_settings(self):
+        """一次性读取下载和Gemini相关设置，运行过程中直接使用属性"""
+        download_settings = self.config.get('download_settings', {})
+        self.max_connections_per_host = max(1, download_settings.get('max_connections_per_host', 4))
+        self.download_max_retries = max(1, download_settings.get('max_retries', 3))
+        self.download_timeout = download_settings.get('timeout', 45)
+        self.max_concurrent_downloads = max(1, download_settings.get('max_concurrent_downloads', 4))
+        self.fast_html = download_settings.get('fast_html', False)
+        self.cache_ttl = download_settings.get('cache_ttl', 3600)
+        self.prealloc = download_settings.get('prealloc', True)
+        gemini_settings = self.config.get('gemini_settings', {})
+        self.gemini_batch_size = max(1, gemini_settings.get('batch_size', 1))
+        self.gemini_max_concurrent_requests = max(1, gemini_settings.get('max_concurrent_requests', 4))
+        self.gemini_requests_per_second = gemini_settings.get('requests_per_second', 2)
+    
+    def _compile_categories(self):
+        """把图片分类冻结为元组，预先转好小写关键词并编译关键词正则，匹配时不再逐次处理"""
+        self._categories = tuple(
+            (category, tuple(self._compile_config_item(config_item) for config_item in config_items))
+            for category, config_items in self.config.get('image_categories', {}).items()
+        )
+    
+    def _compile_config_item(self, config_item):
+        """返回 (配置项, 小写关键词元组, 关键词正则, 关键词特征)，没有关键词时正则为None"""
+        keywords = config_item['keywords']
+        keywords_lower = tuple(keyword.lower() for keyword in keywords)
+        return config_item, keywords_lower, self._compile_keyword_re(keywords_lower), self._config_item_traits(keywords)
+    
+    def _config_item_traits(self, keywords):
+        """预先判断配置项关键词的特征，为文件打分时只需查集合"""
+        traits = set()
+        if any(kw in keywords for kw in ('hero', 'main', 'master', 'large')):
+            traits.add('large')
+        if any(kw in keywords for kw in ('icon', 'thumb', 'small')):
+            traits.add('small')
+        if any(kw in keywords for kw in ('product', 'main', 'detail')):
+            traits.add('product')
+        if any('team' in kw.lower() for kw in keywords):
+            traits.add('team')
+        if any('icon' in kw for kw in keywords):
+            traits.add('icon')
+        if any('1963' in kw for kw in keywords):
+            traits.add('1963')
+        return frozenset(traits)
+    
+    def _compile_keyword_re(self, keywords_lower):
+        """把所有关键词合成一个正则，一次扫描即可判断文本是否含有任一关键词"""
+        if not keywords_lower:
+            return None
+        return re.compile('|'.join(map(re.escape, keywords_lower)))
+    
     def get_page_content(self, url):
         """获取网页内容，带强化的重试机制和反爬虫对策"""
         max_retries = 5
         timeout_values = [30, 45, 60, 75, 90]  # 递增的超时时间
+        use_page_cache = self.use_page_cache
         
         for attempt in range(max_retries):
             try:
@@ -251,7 +887,12 @@ class ImageDownloader:
                 print(f"🌐 正在访问: {url} (尝试 {attempt + 1}/{max_retries}, 超时设置: {timeout}秒)")
                 
                 # 动态调整请求头，模拟不同的浏览器行为
-                self._randomize_headers()
+                # 在锁内修改会话头并生成请求，其他线程不会看到修改到一半的请求头
+                with self._headers_lock:
+                    self._randomize_headers()
+                    request = self.session.prepare_request(requests.Request('GET', url))
+                if use_page_cache:
+                    request.headers.update(self._get_page_conditional_headers(url))
                 
                 # 添加随机延迟，模拟人类访问行为
                 if attempt > 0:
@@ -259,14 +900,16 @@ class ImageDownloader:
                     print(f"⏱️  人类化延迟 {delay} 秒...")
                     time.sleep(delay)
                 
-                response = self.session.get(url, timeout=timeout, allow_redirects=True)
+                settings = self.session.merge_environment_settings(request.url, {}, None, None, None)
+                response = self.session.send(request, timeout=timeout, allow_redirects=True, **settings)
                 
                 # 检查响应状态
                 if response.status_code == 403:
                     print(f"🚫 检测到403 Forbidden错误 - 网站启用了防爬虫机制")
                     if attempt < max_retries - 1:
                         print(f"🔄 尝试使用备用策略...")
-                        self._handle_403_error(url, attempt)
+                        with self._headers_lock:
+                            self._handle_403_error(url, attempt)
                         continue
                     else:
                         print(f"❌ 无法绕过防爬虫机制，建议：")
@@ -283,9 +926,22 @@ class ImageDownloader:
                         time.sleep(wait_time)
                         continue
                 
+                # 页面未修改，使用本地缓存的正文
+                if response.status_code == 304:
+                    cached_page = self._load_cached_page(url)
+                    if cached_page is not None:
+                        print(f"💾 网页未修改，使用本地缓存")
+                        return cached_page
+                    # 缓存在请求期间丢失，去掉条件请求头后重试
+                    use_page_cache = False
+                    continue
+                
                 response.raise_for_status()
                 print(f"✅ 网页访问成功 (状态码: {response.status_code})")
-                return response.text
+                self._save_cached_page(url, response)
+                # 直接返回原始字节，由HTML解析器根据<meta charset>解码，
+                # 避免response.text对整页做编码探测和额外的字符串拷贝
+                return response.content
                 
             except requests.exceptions.Timeout:
                 print(f"⏰ 第 {attempt + 1} 次尝试超时")
@@ -311,27 +967,11 @@ class ImageDownloader:
     
     def _randomize_headers(self):
         """随机化请求头，模拟不同的浏览器环境"""
-        import random
-        
-        user_agents = [
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2.1 Safari/605.1.15',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:122.0) Gecko/20100101 Firefox/122.0',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:122.0) Gecko/20100101 Firefox/122.0'
-        ]
-        
         # 随机选择User-Agent
-        self.session.headers['User-Agent'] = random.choice(user_agents)
+        self.session.headers['User-Agent'] = random.choice(_USER_AGENTS)
         
         # 随机化其他头部
-        accept_languages = [
-            'zh-CN,zh;q=0.9,en;q=0.8',
-            'en-US,en;q=0.9,zh-CN;q=0.8,zh;q=0.7',
-            'zh-CN,zh;q=0.8,zh-TW;q=0.7,zh-HK;q=0.5,en-US;q=0.3,en;q=0.2'
-        ]
-        self.session.headers['Accept-Language'] = random.choice(accept_languages)
+        self.session.headers['Accept-Language'] = random.choice(_ACCEPT_LANGUAGES)
     
     def _handle_403_error(self, url, attempt):
         """处理403错误的特殊策略"""
@@ -352,7 +992,6 @@ class ImageDownloader:
         # 策略3: 添加Referer
         elif attempt == 2:
             print("   - 添加Referer头部")
-            from urllib.parse import urljoin, urlparse
             parsed = urlparse(url)
             base_url = f"{parsed.scheme}://{parsed.netloc}"
             self.session.headers['Referer'] = base_url
@@ -362,65 +1001,99 @@ class ImageDownloader:
             print("   - 使用旧版浏览器标识")
             self.session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     
-    def find_images_on_page(self, html_content, base_url):
-        """在网页中查找图片URL"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+    def find_images_on_page(self, html_content, base_url, seen=None):
+        """在网页中查找图片URL，传入seen时跨页面共享去重集合，只返回此前未出现过的URL"""
+        if seen is None:
+            seen = set()
+        if self.fast_html:
+            return self._find_images_with_regex(html_content, base_url, seen)
+        
+        soup = BeautifulSoup(html_content, HTML_PARSER)
         image_urls = []
-        
-        # 查找所有img标签
-        for img in soup.find_all('img'):
-            src = img.get('src') or img.get('data-src') or img.get('data-lazy-src')
-            if src:
-                # 转换为绝对URL
-                full_url = urljoin(base_url, src)
-                if self.is_valid_image_url(full_url):
-                    image_urls.append(full_url)
+        base_scheme = urlparse(base_url).scheme
+        
+        # 只遍历一次DOM：img标签直接处理，背景图样式先收集，
+        # 待img处理完后再添加，保持img图片在前的发现顺序
+        bg_styles = []
+        for element in soup.find_all(True):
+            if element.name == 'img':
+                src = element.get('src') or element.get('data-src') or element.get('data-lazy-src')
+                if src:
+                    self._add_image_url(src, base_url, base_scheme, seen, image_urls)
+            
+            style = element.get('style')
+            if style and _BG_STYLE_RE.search(style):
+                bg_styles.append(style)
         
         # 查找背景图片
-        for element in soup.find_all(attrs={'style': re.compile(r'background.*?url')}):
-            style = element.get('style', '')
-            urls = re.findall(r'url\(["\']?(.*?)["\']?\)', style)
-            for url in urls:
-                full_url = urljoin(base_url, url)
-                if self.is_valid_image_url(full_url):
-                    image_urls.append(full_url)
+        for style in bg_styles:
+            for url in _CSS_URL_RE.findall(style):
+                self._add_image_url(url, base_url, base_scheme, seen, image_urls)
         
-        return list(set(image_urls))  # 去重
+        return image_urls
     
-    def is_valid_image_url(self, url):
-        """检查是否为有效的图片URL"""
-        image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp']
-        parsed_url = urlparse(url)
-        path = parsed_url.path.lower()
+    def _find_images_with_regex(self, html_content, base_url, seen):
+        """快速模式：用预编译正则直接提取图片URL，适用于结构简单的页面"""
+        image_urls = []
+        base_scheme = urlparse(base_url).scheme
         
-        # 检查文件扩展名
-        for ext in image_extensions:
-            if path.endswith(ext):
-                return True
+        # 提取img标签的src/data-src/data-lazy-src
+        for match in _IMG_TAG_RE.finditer(html_content):
+            src = match.group(1).decode('utf-8', 'ignore')
+            self._add_image_url(html.unescape(src), base_url, base_scheme, seen, image_urls)
         
-        # 检查是否包含常见的图片关键词
-        image_keywords = ['img', 'image', 'photo', 'pic', 'thumb', 'banner']
-        for keyword in image_keywords:
-            if keyword in path:
-                return True
+        # 提取内联样式中的背景图片
+        for match in _STYLE_ATTR_RE.finditer(html_content):
+            style = match.group(2).decode('utf-8', 'ignore')
+            if not _BG_STYLE_RE.search(style):
+                continue
+            for url in _CSS_URL_RE.findall(style):
+                self._add_image_url(html.unescape(url), base_url, base_scheme, seen, image_urls)
         
-        return False
+        return image_urls
+    
+    def _add_image_url(self, src, base_url, base_scheme, seen, image_urls):
+        """转换并去重单个图片地址，有效时按发现顺序追加到image_urls"""
+        src = src.strip()
+        # 跳过空地址和内嵌的data URI
+        if not src or src.startswith('data:'):
+            return
+        
+        full_url = _canonical_url(self._absolutize_url(src, base_url, base_scheme))
+        # 先查重再校验，重复出现的地址不再重复解析
+        if full_url in seen:
+            return
+        seen.add(full_url)
+        
+        if self.is_valid_image_url(full_url):
+            image_urls.append(full_url)
+    
+    def _absolutize_url(self, src, base_url, base_scheme):
+        """转换为绝对URL，已是绝对地址或协议相对地址时跳过urljoin"""
+        if src.startswith(('http://', 'https://')):
+            return src
+        if src.startswith('//'):
+            return f"{base_scheme}:{src}"
+        return urljoin(base_url, src)
+    
+    def is_valid_image_url(self, url):
+        """检查是否为有效的图片URL"""
+        # 检查文件扩展名，或是否包含常见的图片关键词
+        return _IMAGE_URL_PATH_RE.search(urlparse(url).path) is not None
     
     def download_image(self, url, filename):
         """下载单张图片，带重试和验证机制"""
-        max_retries = 3
+        max_retries = self.download_max_retries
         
         for attempt in range(max_retries):
             try:
                 print(f"📥 正在下载: {filename}" + (f" (重试 {attempt + 1})" if attempt > 0 else ""))
                 
                 # 为图片下载设置专门的请求头
-                image_headers = {
-                    'Accept': 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
-                    'Sec-Fetch-Dest': 'image',
-                    'Sec-Fetch-Mode': 'no-cors',
-                    'Sec-Fetch-Site': 'same-origin',
-                }
+                image_headers = dict(_IMAGE_REQUEST_HEADERS)
+                # --force 时不发送条件请求头，避免服务器返回304而保留本地文件
+                if not self.force_download:
+                    image_headers.update(self._get_conditional_headers(url, filename))
                 
                 # 如果是重试，添加延迟
                 if attempt > 0:
@@ -428,56 +1101,82 @@ class ImageDownloader:
                     print(f"   ⏱️  等待 {delay} 秒后重试...")
                     time.sleep(delay)
                 
-                response = self.session.get(url, timeout=45, stream=True, headers=image_headers)
-                
-                # 检查响应状态
-                if response.status_code == 403:
-                    print(f"   🚫 图片访问被拒绝 (403)")
-                    if attempt < max_retries - 1:
-                        # 尝试不带额外头部下载
-                        print(f"   🔄 尝试简化请求头...")
-                        continue
-                    else:
-                        print(f"   ❌ 无法下载此图片，可能受到访问限制")
-                        return False
+                # 使用with确保流式响应被关闭，连接归还连接池以复用keep-alive
+                with self.session.get(url, timeout=self.download_timeout, stream=True, headers=image_headers) as response:
+                    # 检查响应状态
+                    if response.status_code == 403:
+                        print(f"   🚫 图片访问被拒绝 (403)")
+                        if attempt < max_retries - 1:
+                            # 尝试不带额外头部下载
+                            print(f"   🔄 尝试简化请求头...")
+                            continue
+                        else:
+                            print(f"   ❌ 无法下载此图片，可能受到访问限制")
+                            return False
+                    
+                    # 304表示服务器上的图片未变化，本地文件可直接沿用
+                    if response.status_code == 304:
+                        print(f"✅ 图片未变化，沿用本地文件: {filename}")
+                        return True
                 
-                response.raise_for_status()
+                    response.raise_for_status()
                 
-                # 验证内容类型
-                content_type = response.headers.get('content-type', '').lower()
-                if not any(img_type in content_type for img_type in ['image/', 'application/octet-stream']):
-                    print(f"   ⚠️  警告: 响应内容类型可能不是图片 ({content_type})")
+                    # 验证内容类型
+                    content_type = response.headers.get('content-type', '').lower()
+                    if not any(img_type in content_type for img_type in ['image/', 'application/octet-stream']):
+                        print(f"   ⚠️  警告: 响应内容类型可能不是图片 ({content_type})")
                 
-                file_path = self.images_dir / filename
+                    file_path = self.images_dir / filename
                 
-                # 下载文件
-                with open(file_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+                    # 图片请求不接受压缩编码，正常响应原样写入；个别服务器仍返回压缩内容时
+                    # 由urllib3按Content-Encoding解压，再用大缓冲区整块拷贝到文件，
+                    # 写完后直接取文件位置作为大小，省去stat调用
+                    response.raw.decode_content = True
+                    try:
+                        with open(file_path, 'wb') as f:
+                            preallocated = self._preallocate(f, response)
+                            # 单独读取第一块，用文件头判断内容是否为已知图片格式
+                            head = response.raw.read(_COPY_BUFFER_SIZE)
+                            f.write(head)
+                            shutil.copyfileobj(response.raw, f, _COPY_BUFFER_SIZE)
+                            file_size = f.tell()
+                            # 实际写入量与预分配大小不一致时截断到实际长度
+                            if preallocated and preallocated != file_size:
+                                f.truncate(file_size)
+                    except BaseException:
+                        # 中途失败时删除写了一半（或预分配后补零）的文件，避免被当作已下载
+                        file_path.unlink(missing_ok=True)
+                        raise
                 
-                # 验证下载的文件
-                file_size = file_path.stat().st_size
-                if file_size == 0:
-                    print(f"   ❌ 下载的文件为空")
-                    file_path.unlink(missing_ok=True)  # 删除空文件
-                    if attempt < max_retries - 1:
-                        continue
-                    return False
-                elif file_size < 100:  # 小于100字节可能是错误页面
-                    print(f"   ⚠️  下载的文件很小 ({file_size} bytes)，可能是错误响应")
-                    # 检查文件内容
-                    with open(file_path, 'r', errors='ignore') as f:
-                        content = f.read()
-                        if any(error_text in content.lower() for error_text in ['error', '404', '403', 'forbidden', 'not found']):
-                            print(f"   ❌ 文件内容包含错误信息")
-                            file_path.unlink(missing_ok=True)
-                            if attempt < max_retries - 1:
-                                continue
-                            return False
+                    # 验证下载的文件
+                    if file_size == 0:
+                        print(f"   ❌ 下载的文件为空")
+                        file_path.unlink(missing_ok=True)  # 删除空文件
+                        if attempt < max_retries - 1:
+                            continue
+                        return False
+                    elif file_size < 100 and not head.startswith(_IMAGE_MAGIC_NUMBERS):  # 小于100字节且不是图片，可能是错误页面
+                        print(f"   ⚠️  下载的文件很小 ({file_size} bytes)，可能是错误响应")
+                        # 检查文件内容
+                        with open(file_path, 'r', errors='ignore') as f:
+                            content = f.read()
+                            if any(error_text in content.lower() for error_text in ['error', '404', '403', 'forbidden', 'not found']):
+                                print(f"   ❌ 文件内容包含错误信息")
+                                file_path.unlink(missing_ok=True)
+                                if attempt < max_retries - 1:
+                                    continue
+                                return False
                 
-                print(f"✅ 下载完成: {filename} ({self.format_file_size(file_size)})")
-                return True
+                    # 记录校验信息，下次运行时可发起条件请求
+                    self.download_cache[filename] = {
+                        'url': url,
+                        'size': file_size,
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                    }
+                    
+                    print(f"✅ 下载完成: {filename} ({self.format_file_size(file_size)})")
+                    return True
                 
             except requests.exceptions.Timeout:
                 print(f"   ⏰ 下载超时")
@@ -493,16 +1192,36 @@ class ImageDownloader:
         print(f"❌ 下载失败: {filename} - 已尝试 {max_retries} 次")
         return False
     
+    def _preallocate(self, f, response):
+        """按Content-Length为文件预分配磁盘空间，减少边写边扩展的开销，返回预分配的字节数"""
+        if not self.prealloc:
+            return 0
+        if not hasattr(os, 'posix_fallocate'):
+            return 0
+        # 压缩传输时Content-Length是压缩后的长度，与写入的字节数不符
+        if response.headers.get('Content-Encoding', 'identity') != 'identity':
+            return 0
+        try:
+            size = int(response.headers.get('Content-Length', 0))
+        except ValueError:
+            return 0
+        if size <= 0:
+            return 0
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+        except OSError:
+            # 部分文件系统不支持预分配，直接按普通方式写入
+            return 0
+        return size
+    
     def format_file_size(self, size_bytes):
         """格式化文件大小显示"""
         if size_bytes == 0:
             return "0 B"
-        size_names = ["B", "KB", "MB", "GB"]
-        import math
-        i = int(math.floor(math.log(size_bytes, 1024)))
-        p = math.pow(1024, i)
-        s = round(size_bytes / p, 1)
-        return f"{s} {size_names[i]}"
+        # 由二进制位数直接得出单位档位，每档相差2^10，无需浮点对数运算
+        i = min(len(_SIZE_UNITS) - 1, (int(size_bytes).bit_length() - 1) // 10)
+        s = round(size_bytes / (1 << (i * 10)), 1)
+        return f"{s} {_SIZE_UNITS[i]}"
     
     def search_and_download_images(self):
         """搜索并下载配置文件中指定的图片"""
@@ -510,6 +1229,8 @@ class ImageDownloader:
         print(f"🚀 开始下载 {site_name} 图片...")
         print("=" * 60)
         
+        # 使用单调时钟计时，不受系统时间调整影响
+        start_time = time.monotonic()
         total_downloaded = 0
         total_failed = 0
         
@@ -526,7 +1247,7 @@ class ImageDownloader:
         # 根据设置的模式标志选择下载方式
         if self.force_matching_mode:
             print("\n🎯 使用智能匹配模式")
-            total_downloaded, total_failed = self.download_with_matching()
+            total_downloaded, total_failed = self.download_with_matching(all_image_urls)
         elif self.force_download_all:
             print("\n📥 使用全量下载模式")
             total_downloaded, total_failed = self.download_all_images(all_image_urls)
@@ -544,7 +1265,7 @@ class ImageDownloader:
                 choice = "2"
             
             if choice == "1":
-                total_downloaded, total_failed = self.download_with_matching()
+                total_downloaded, total_failed = self.download_with_matching(all_image_urls)
             else:
                 total_downloaded, total_failed = self.download_all_images(all_image_urls)
         
@@ -552,103 +1273,156 @@ class ImageDownloader:
         print(f"📊 下载统计:")
         print(f"✅ 成功下载: {total_downloaded} 张")
         print(f"❌ 下载失败: {total_failed} 张")
+        print(f"⏱️  总耗时: {time.monotonic() - start_time:.1f} 秒")
         print("🎉 下载任务完成!")
         
+        self._save_download_cache()
+        
         # 如果有成功下载的图片，执行智能重命名（除非是Gemini模式）
         if total_downloaded > 0 and not self.use_gemini_vision:
             self.smart_rename_images()
     
     def get_all_image_urls(self):
         """获取所有图片URL"""
-        # 首先访问主页，获取所有可能的图片URL
-        main_page_content = self.get_page_content(self.base_url)
-        if not main_page_content:
-            print("❌ 无法访问主页，退出程序")
-            return []
-        
-        # 获取主页所有图片URL
-        all_image_urls = self.find_images_on_page(main_page_content, self.base_url)
-        print(f"🔍 在主页找到 {len(all_image_urls)} 张图片")
+        cached_urls = self._get_cached_image_urls()
+        if cached_urls is not None:
+            print(f"💾 使用缓存的图片列表: {len(cached_urls)} 张（加 --refresh 参数可重新抓取）")
+            return cached_urls
         
         # 已知有效的页面列表（已验证可访问）
         working_pages = [
             'news/', 'master/'
         ]
+        page_urls = [urljoin(self.base_url, page) for page in working_pages]
+        
+        # 主页和已知页面互不依赖，并发抓取以重叠网络等待时间
+        with ThreadPoolExecutor(max_workers=len(page_urls) + 1) as executor:
+            page_contents = list(executor.map(self.get_page_content, [self.base_url] + page_urls))
+        main_page_content = page_contents[0]
+        
+        if not main_page_content:
+            print("❌ 无法访问主页，退出程序")
+            return []
         
-        # 访问已知有效的页面
-        for page in working_pages:
-            page_url = urljoin(self.base_url, page)
-            page_content = self.get_page_content(page_url)
+        # 所有页面共用一个去重集合，每个URL只校验一次，且保持发现顺序以便文件编号在多次运行间保持稳定
+        seen = set()
+        
+        # 获取主页所有图片URL
+        image_urls = self.find_images_on_page(main_page_content, self.base_url, seen)
+        print(f"🔍 在主页找到 {len(image_urls)} 张图片")
+        
+        # 解析已知有效的页面
+        for page, page_url, page_content in zip(working_pages, page_urls, page_contents[1:]):
             if page_content:
-                page_images = self.find_images_on_page(page_content, page_url)
-                all_image_urls.extend(page_images)
-                print(f"🔍 在 {page} 找到 {len(page_images)} 张图片")
-            time.sleep(0.5)  # 减少等待时间，提高效率
+                page_images = self.find_images_on_page(page_content, page_url, seen)
+                image_urls.extend(page_images)
+                print(f"🔍 在 {page} 找到 {len(page_images)} 张新图片")
         
-        # 去重所有图片URL
-        return list(set(all_image_urls))
+        if image_urls:
+            self._save_cached_image_urls(image_urls)
+        return image_urls
     
-    def download_with_matching(self):
-        """使用配置文件匹配下载"""
-        all_image_urls = self.get_all_image_urls()
-        total_downloaded = 0
+    def download_with_matching(self, all_image_urls):
+        """使用配置文件匹配下载，all_image_urls为已抓取到的图片URL列表"""
+        url_entries = self._prepare_url_entries(all_image_urls)
+        download_jobs = []
         total_failed = 0
         
-        # 根据配置文件下载指定图片
-        for category, images in self.config['image_categories'].items():
+        # 先根据配置文件为每个目标文件名选出最佳图片
+        for category, images in self._categories:
             print(f"\n📁 正在处理分类: {category}")
             print("-" * 40)
             
-            for image_info in images:
+            for image_info, keywords_lower, keyword_re, _ in images:
                 filename = image_info['filename']
-                keywords = image_info['keywords']
                 description = image_info['description']
                 
                 print(f"🎯 寻找匹配图片: {description}")
                 
                 # 根据关键词匹配最合适的图片
-                best_match = self.find_best_matching_image(all_image_urls, keywords)
+                best_match = self.find_best_matching_image(url_entries, keywords_lower, keyword_re)
                 
                 if best_match:
-                    if self.download_image(best_match, filename):
-                        total_downloaded += 1
-                    else:
-                        total_failed += 1
+                    download_jobs.append((best_match, filename))
                 else:
                     print(f"⚠️  未找到匹配的图片: {filename}")
                     total_failed += 1
-                
-                time.sleep(0.5)  # 避免下载过快
         
-        return total_downloaded, total_failed
+        # 再统一并发下载所有匹配到的图片
+        print(f"\n📥 开始下载匹配的图片 (共 {len(download_jobs)} 张)")
+        print("-" * 60)
+        total_downloaded, download_failed = self._download_concurrently(download_jobs)
+        
+        return total_downloaded, total_failed + download_failed
     
     def download_all_images(self, image_urls):
         """下载所有找到的图片"""
+        print(f"\n📥 开始下载所有图片 (共 {len(image_urls)} 张)")
+        print("-" * 60)
+        
+        download_jobs = [(url, self.generate_filename(url, i)) for i, url in enumerate(image_urls, 1)]
+        return self._download_concurrently(download_jobs)
+    
+    def _get_host_slot(self, url):
+        """返回URL所属主机的并发信号量，首次访问该主机时创建"""
+        host = urlsplit(url).netloc
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.max_connections_per_host)
+            return slot
+    
+    def _download_concurrently(self, download_jobs):
+        """用固定大小的线程池并发下载 (url, filename) 任务列表，返回成功和失败数量（不含跳过的已存在图片）"""
         total_downloaded = 0
         total_failed = 0
+        total_skipped = 0
+        total = len(download_jobs)
+        max_workers = self.max_concurrent_downloads
         
-        print(f"\n📥 开始下载所有图片 (共 {len(image_urls)} 张)")
-        print("-" * 60)
+        print(f"⚡ 并发下载数: {max_workers}")
         
-        for i, url in enumerate(image_urls, 1):
-            # 生成文件名
-            filename = self.generate_filename(url, i)
-            
-            print(f"📥 [{i}/{len(image_urls)}] 正在下载: {filename}")
-            
-            if self.download_image(url, filename):
-                total_downloaded += 1
-            else:
-                total_failed += 1
+        def download_one(index, job):
+            url, filename = job
+            if self._is_already_downloaded(url, filename):
+                print(f"↻ [{index}/{total}] 已存在，跳过: {filename}")
+                return None
+            print(f"📥 [{index}/{total}] 正在下载: {filename}")
             
-            time.sleep(0.3)  # 避免下载过快
+            # 按主机限流代替统一的固定延迟，不同主机的下载互不等待
+            with self._get_host_slot(url):
+                return self.download_image(url, filename)
+        
+        # 固定数量的工作线程从任务队列中取任务，结果按完成情况累计
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for success in executor.map(download_one, range(1, total + 1), download_jobs):
+                if success is None:
+                    total_skipped += 1
+                elif success:
+                    total_downloaded += 1
+                else:
+                    total_failed += 1
         
+        if total_skipped:
+            print(f"↻ 已存在跳过: {total_skipped} 张（加 --force 参数可重新下载）")
         return total_downloaded, total_failed
     
+    def _is_already_downloaded(self, url, filename):
+        """本地已有同名非空文件且与下载缓存记录一致时返回True，--force 时总是重新下载"""
+        if self.force_download or filename not in self._existing_files:
+            return False
+        # 下载缓存记录了该文件的来源时，只有URL相同且大小一致才算已下载
+        # （匹配模式的固定文件名可能对应新的图片，大小不符说明文件不完整或被改动）
+        cached = self.download_cache.get(filename)
+        if cached is None:
+            return True
+        return cached.get('url') == url and cached.get('size') == self._existing_files[filename]
+    
     def generate_filename(self, url, index):
         """根据URL生成合适的文件名"""
-        parsed_url = urlparse(url)
-        original_filename = os.path.basename(parsed_url.path)
+        # 只解析一次URL，文件名和路径片段都从同一个path中截取
+        path = urlparse(url).path
+        original_filename = path.rpartition('/')[2]
         
         if original_filename and '.' in original_filename:
             # 有原始文件名
@@ -656,38 +1430,50 @@ class ImageDownloader:
             return f"image_{index:03d}_{name}{ext}"
         else:
             # 没有原始文件名，根据URL特征生成
-            url_parts = [part for part in parsed_url.path.split('/') if part]
+            url_parts = [part for part in path.split('/') if part]
             if url_parts:
                 name_part = '_'.join(url_parts[-2:])  # 取最后两个路径部分
                 return f"image_{index:03d}_{name_part}.jpg"
             else:
                 return f"image_{index:03d}.jpg"
     
-    def find_best_matching_image(self, image_urls, keywords):
-        """根据关键词找到最匹配的图片URL - 优化版本"""
-        scored_images = []
-        
+    def _prepare_url_entries(self, image_urls):
+        """预先算好每个URL的小写形式、路径和文件名，供所有配置项的匹配复用"""
+        url_entries = []
         for url in image_urls:
+            path_lower = urlparse(url).path.lower()
+            url_entries.append((url, url.lower(), path_lower, path_lower.rpartition('/')[2]))
+        return url_entries
+    
+    def find_best_matching_image(self, url_entries, keywords, keyword_re=None):
+        """根据关键词找到最匹配的图片URL - 优化版本，url_entries由_prepare_url_entries生成，
+        keyword_re为加载配置时预编译的关键词正则"""
+        # 只保留当前最高分，无需为每个URL分配元组再整体排序
+        best_url = None
+        best_score = -1
+        
+        keywords_lower = [keyword.lower() for keyword in keywords]
+        # 文件名和路径都是URL的一部分，关键词正则扫描不到的URL不可能在逐词计分中得分
+        if keyword_re is None:
+            keyword_re = self._compile_keyword_re(keywords_lower)
+        
+        for url, url_lower, path, filename in url_entries:
             score = 0
-            url_lower = url.lower()
             
             # 计算匹配分数 - 更宽松的匹配策略
-            for keyword in keywords:
-                keyword_lower = keyword.lower()
-                
-                # URL中包含关键词
-                if keyword_lower in url_lower:
-                    score += 5
+            if keyword_re is not None and keyword_re.search(url_lower):
+                for keyword_lower in keywords_lower:
+                    # URL中包含关键词
+                    if keyword_lower in url_lower:
+                        score += 5
+                        
+                    # 文件名匹配权重更高
+                    if keyword_lower in filename:
+                        score += 15
                     
-                # 文件名匹配权重更高
-                filename = os.path.basename(urlparse(url).path).lower()
-                if keyword_lower in filename:
-                    score += 15
-                
-                # 路径匹配
-                path = urlparse(url).path.lower()
-                if keyword_lower in path:
-                    score += 8
+                    # 路径匹配
+                    if keyword_lower in path:
+                        score += 8
             
             # 即使没有关键词匹配，也给一个基础分数，确保有图片被下载
             if score == 0:
@@ -699,14 +1485,12 @@ class ImageDownloader:
                 else:
                     score = 1  # 给所有图片一个基础分数
             
-            scored_images.append((url, score))
+            # 同分时保留先出现的URL，与稳定排序的结果一致
+            if score > best_score:
+                best_url = url
+                best_score = score
         
-        # 按分数排序，返回最高分的URL
-        if scored_images:
-            scored_images.sort(key=lambda x: x[1], reverse=True)
-            return scored_images[0][0]
-        
-        return None
+        return best_url
     
     def manual_download_mode(self):
         """手动下载模式 - 显示所有找到的图片供用户选择"""
@@ -731,6 +1515,18 @@ class ImageDownloader:
         if len(all_image_urls) > 50:
             print(f"... 还有 {len(all_image_urls) - 50} 张图片未显示")
     
+    def _scan_image_files(self, prefix='', extensions=None):
+        """单次遍历images目录，返回匹配文件的 (路径, 文件大小) 列表"""
+        image_files = []
+        with os.scandir(self.images_dir) as entries:
+            for entry in entries:
+                if not entry.name.startswith(prefix) or not entry.is_file():
+                    continue
+                if extensions and not entry.name.lower().endswith(extensions):
+                    continue
+                image_files.append((Path(entry.path), entry.stat().st_size))
+        return image_files
+    
     def smart_rename_images(self):
         """智能重命名images目录下的图片文件"""
         print("\n" + "=" * 60)
@@ -742,7 +1538,7 @@ class ImageDownloader:
             return
         
         # 获取所有图片文件
-        image_files = list(self.images_dir.glob("image_*"))
+        image_files = self._scan_image_files(prefix='image_')
         if not image_files:
             print("📂 未找到需要重命名的图片文件")
             return
@@ -751,17 +1547,16 @@ class ImageDownloader:
         
         # 存储重命名映射
         rename_mapping = {}
-        used_names = set()
+        # 以目录中现有的文件名为起点，新文件名不会覆盖已有文件
+        with os.scandir(self.images_dir) as entries:
+            used_names = {entry.name for entry in entries}
         
-        # 为每个分类创建匹配计数器
-        category_counters = {}
-        for category in self.config['image_categories'].keys():
-            category_counters[category] = 1
+        # 记录每个配置文件名下一个待尝试的序号，同名文件较多时不必每次从1开始查找
+        name_counters = {}
         
         # 遍历所有图片文件进行智能匹配
-        for image_file in image_files:
+        for image_file, file_size in image_files:
             original_name = image_file.name
-            file_size = image_file.stat().st_size
             
             print(f"\n🔍 分析文件: {original_name}")
             print(f"   文件大小: {self.format_file_size(file_size)}")
@@ -774,13 +1569,12 @@ class ImageDownloader:
                 
                 # 生成新的文件名
                 new_name = self.generate_smart_filename(
-                    config_item, category, category_counters, used_names, original_name
+                    config_item, category, name_counters, used_names, original_name
                 )
                 
                 if new_name != original_name:
                     rename_mapping[original_name] = new_name
                     used_names.add(new_name)
-                    category_counters[category] += 1
                     
                     print(f"   ✅ 匹配成功: {config_item['description']}")
                     print(f"   📝 新文件名: {new_name}")
@@ -800,10 +1594,12 @@ class ImageDownloader:
                 
                 try:
                     old_path.rename(new_path)
+                    self._move_download_cache_entry(old_name, new_name)
                     print(f"   ✅ {old_name} → {new_name}")
                 except Exception as e:
                     print(f"   ❌ 重命名失败 {old_name}: {e}")
             
+            self._save_download_cache()
             print(f"\n🎉 智能重命名完成! 成功重命名 {len(rename_mapping)} 个文件")
         else:
             print("\n📂 所有文件名都已是最佳匹配，无需重命名")
@@ -813,14 +1609,15 @@ class ImageDownloader:
         best_score = 0
         best_match = None
         filename_lower = filename.lower()
+        # 长数字ID只与文件名有关，在遍历配置项之前判断一次
+        has_long_number = _LONG_NUMBER_RE.search(filename) is not None
         
-        for category, config_items in self.config['image_categories'].items():
-            for config_item in config_items:
+        for category, config_items in self._categories:
+            for config_item, keywords_lower, _, traits in config_items:
                 score = 0
                 
                 # 基于关键词匹配
-                for keyword in config_item['keywords']:
-                    keyword_lower = keyword.lower()
+                for keyword_lower in keywords_lower:
                     if keyword_lower in filename_lower:
                         # 关键词匹配给分
                         if len(keyword_lower) > 3:  # 长关键词权重更高
@@ -830,23 +1627,22 @@ class ImageDownloader:
                 
                 # 基于文件大小特征匹配
                 if file_size > 5 * 1024 * 1024:  # 大于5MB，可能是高质量产品图
-                    if any(kw in config_item['keywords'] for kw in ['hero', 'main', 'master', 'large']):
+                    if 'large' in traits:
                         score += 10
                 elif file_size < 50 * 1024:  # 小于50KB，可能是图标
-                    if any(kw in config_item['keywords'] for kw in ['icon', 'thumb', 'small']):
+                    if 'small' in traits:
                         score += 10
                 
                 # 基于文件名模式匹配
-                if 'team' in filename_lower and 'team' in ' '.join(config_item['keywords']).lower():
+                if 'team' in filename_lower and 'team' in traits:
                     score += 20
-                if 'footer' in filename_lower and any('icon' in kw for kw in config_item['keywords']):
+                if 'footer' in filename_lower and 'icon' in traits:
                     score += 20
-                if any(year in filename_lower for year in ['1963']) and '1963' in ' '.join(config_item['keywords']):
+                if '1963' in filename_lower and '1963' in traits:
                     score += 25
                 
                 # 基于数字ID模式判断（长数字ID通常是产品图）
-                long_numbers = re.findall(r'\d{10,}', filename)
-                if long_numbers and any(kw in config_item['keywords'] for kw in ['product', 'main', 'detail']):
+                if has_long_number and 'product' in traits:
                     score += 8
                 
                 if score > best_score:
@@ -864,9 +1660,9 @@ class ImageDownloader:
         base_name = config_item['filename']
         name_without_ext, _ = os.path.splitext(base_name)
         
-        # 如果配置的文件名已经被使用，添加序号
+        # 如果配置的文件名已经被使用，从上次用到的序号开始继续添加序号
         new_name = base_name
-        counter = 1
+        counter = counters.get(base_name, 1)
         
         while new_name in used_names:
             name_parts = name_without_ext.split('_')
@@ -879,6 +1675,7 @@ class ImageDownloader:
             new_name = '_'.join(name_parts) + ext
             counter += 1
         
+        counters[base_name] = counter
         return new_name
     
     def analyze_image_features(self, image_path):
@@ -893,7 +1690,7 @@ class ImageDownloader:
                 'is_small': file_size < 100 * 1024,       # 小于100KB
                 'is_icon': 'icon' in filename or file_size < 10 * 1024,
                 'is_banner': 'banner' in filename or file_size > 1024 * 1024,
-                'has_numbers': bool(re.search(r'\d{10,}', filename)),
+                'has_numbers': bool(_LONG_NUMBER_RE.search(filename)),
                 'has_team': 'team' in filename,
                 'has_footer': 'footer' in filename,
             }
@@ -903,55 +1700,72 @@ class ImageDownloader:
             print(f"   ⚠️  分析图片特征失败: {e}")
             return {'size': 0}
     
+    def _wait_for_gemini_slot(self):
+        """按requests_per_second限制请求速率，必要时等待到下一个可用时间点"""
+        if self.gemini_requests_per_second <= 0:
+            return
+        interval = 1.0 / self.gemini_requests_per_second
+        with self._gemini_rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._gemini_next_request)
+            self._gemini_next_request = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+    
+    def _generate_gemini_content(self, parts):
+        """调用Gemini生成内容，频率受限时按Retry-After或指数退避重试，地理位置限制时抛出GeminiLocationError"""
+        for attempt in range(_GEMINI_MAX_ATTEMPTS):
+            self._wait_for_gemini_slot()
+            if self._gemini_location_blocked.is_set():
+                raise GeminiLocationError("User location is not supported for the API use.")
+            try:
+                return self.gemini_model.generate_content(parts)
+            except Exception as e:
+                if "User location is not supported" in str(e):
+                    # 只由第一个遇到限制的线程输出提示，其余线程随后直接放弃请求
+                    if not self._gemini_location_blocked.is_set():
+                        self._gemini_location_blocked.set()
+                        print(f"   ❌ Gemini 分析失败: {e}")
+                        print("   🚫 检测到地理位置限制错误")
+                        print("   💡 请使用VPN连接到支持的地区，或使用基础重命名模式")
+                    raise GeminiLocationError(str(e)) from e
+                if not _is_gemini_rate_limited(e) or attempt == _GEMINI_MAX_ATTEMPTS - 1:
+                    raise
+                delay = _get_retry_after(e)
+                if delay is None:
+                    delay = min(_GEMINI_MAX_BACKOFF, 2 ** attempt) + random.uniform(0, 1)
+                print(f"   🐌 Gemini请求频率受限，{delay:.1f} 秒后重试 ({attempt + 1}/{_GEMINI_MAX_ATTEMPTS - 1})")
+                time.sleep(delay)
+    
+    def _prepare_vision_payload(self, image):
+        """把图片缩小到长边不超过_GEMINI_MAX_IMAGE_SIDE并转为RGB，减少上传数据量和图片token"""
+        size = (_GEMINI_MAX_IMAGE_SIDE, _GEMINI_MAX_IMAGE_SIDE)
+        # JPEG在解码时即可按1/2、1/4、1/8缩小，大图不必完整解码
+        image.draft('RGB', size)
+        payload = image.convert('RGB') if image.mode != 'RGB' else image.copy()
+        payload.thumbnail(size, Image.LANCZOS)
+        return payload
+    
+    def _open_vision_payload(self, image_path):
+        """打开图片文件并返回缩小后的图片和原始尺寸"""
+        with Image.open(image_path) as image:
+            original_size = image.size
+            return self._prepare_vision_payload(image), original_size
+    
     def analyze_image_with_gemini(self, image_path):
-        """使用 Gemini Vision API 分析图片内容 - 保持原始分辨率"""
+        """使用 Gemini Vision API 分析图片内容 - 发送缩小后的图片"""
         if not self.use_gemini_vision or not self.gemini_model:
             return None
         
         try:
-            # 打开图片但保持原始大小
-            image = Image.open(image_path)
+            image, (width, height) = self._open_vision_payload(image_path)
             
-            print(f"   📐 原始图片尺寸: {image.width}x{image.height}")
-            
-            # 构建分析提示词
-            prompt = """
-请分析这张网站图片，并识别以下信息：
-
-1. 图片类型：
-   - hero/banner: 大幅宣传图、英雄图、横幅
-   - product: 产品图、商品图
-   - detail: 细节图、特写图
-   - icon: 小图标、按钮图标
-   - news: 新闻图片、文章图片
-   - team: 团队照片、人物照片
-   - gallery: 画廊图片、展示图片
-   - background: 背景图
-
-2. 内容特征：
-   - 主要产品或服务的特征
-   - 品牌元素和视觉风格
-   - 图片的主要用途和功能
-
-3. 图片质量和用途：
-   - main: 高质量主图
-   - thumb: 缩略图
-   - detail: 详情图
-   - icon: 图标
-
-请用JSON格式回复：
-{
-    "type": "图片类型",
-    "content": "内容描述",
-    "quality": "图片质量",
-    "description": "简短描述",
-    "confidence": "置信度(1-10)"
-}"""
+            print(f"   📐 原始图片尺寸: {width}x{height}，发送尺寸: {image.width}x{image.height}")
             
             print("   🤖 正在调用 Gemini Vision API 分析图片...")
             
-            # 调用 Gemini Vision API - 使用原始图片
-            response = self.gemini_model.generate_content([prompt, image])
+            # 调用 Gemini Vision API
+            response = self._generate_gemini_content([_GEMINI_ANALYSIS_PROMPT, image])
             
             if response.text:
                 print(f"   ✅ AI分析成功")
@@ -961,21 +1775,105 @@ class ImageDownloader:
                 print("   ❌ AI分析无响应")
                 return None
                 
+        except GeminiLocationError:
+            # 批量处理中遇到地理位置错误时交给调用方终止剩余任务
+            if hasattr(self, '_in_batch_processing'):
+                raise
+            return None
         except Exception as e:
-            error_msg = str(e)
-            print(f"   ❌ Gemini 分析失败: {error_msg}")
+            print(f"   ❌ Gemini 分析失败: {e}")
+            return None
+    
+    def analyze_images_with_gemini(self, image_paths):
+        """一次请求分析多张图片，返回与image_paths顺序对应的分析结果列表"""
+        if len(image_paths) == 1:
+            return [self.analyze_image_with_gemini(image_paths[0])]
+        if not self.use_gemini_vision or not self.gemini_model:
+            return [None] * len(image_paths)
+        
+        try:
+            images = [self._open_vision_payload(image_path)[0] for image_path in image_paths]
+            prompt = (f"{_GEMINI_ANALYSIS_PROMPT}\n\n本次共提供 {len(images)} 张图片，"
+                      "请按图片顺序返回一个JSON数组，每个元素对应一张图片，格式同上。")
             
-            # 检查是否为地理位置限制错误
-            if "User location is not supported" in error_msg:
-                print("   🚫 检测到地理位置限制错误")
-                print("   💡 请使用VPN连接到支持的地区，或使用基础重命名模式")
-                # 如果在批量处理中遇到地理位置错误，直接退出
-                if hasattr(self, '_in_batch_processing'):
-                    print("\n🛑 由于地理位置限制，批量处理将终止")
-                    sys.exit(1)
+            print(f"   🤖 正在调用 Gemini Vision API 批量分析 {len(images)} 张图片...")
+            response = self._generate_gemini_content([prompt] + images)
             
+            text = response.text.strip() if response.text else ''
+            start = text.find('[')
+            end = text.rfind(']') + 1
+            if start >= 0 and end > start:
+                items = json.loads(text[start:end])
+                if isinstance(items, list) and len(items) == len(image_paths):
+                    print(f"   ✅ 批量AI分析成功")
+                    # 拆分为单张图片的分析结果，沿用逐张处理时的解析流程
+                    return [json.dumps(item, ensure_ascii=False) if isinstance(item, dict) else None
+                            for item in items]
+            print("   ⚠️  批量分析结果与图片数量不符，改为逐张分析")
+        except GeminiLocationError:
+            # 地理位置限制不是批量请求本身的问题，由单张分析决定终止还是返回None
+            return [self.analyze_image_with_gemini(image_path) for image_path in image_paths]
+        except Exception as e:
+            print(f"   ⚠️  批量分析失败，改为逐张分析: {e}")
+        
+        # 批量请求失败时逐张重试，地理位置限制等错误由单张分析统一处理
+        return [self.analyze_image_with_gemini(image_path) for image_path in image_paths]
+    
+    def _parse_gemini_analysis(self, gemini_analysis):
+        """从AI响应文本中提取JSON对象，找不到JSON时返回None"""
+        text = gemini_analysis.strip()
+        start = text.find('{')
+        end = text.rfind('}') + 1
+        if start >= 0 and end > start:
+            return json.loads(text[start:end])
+        return None
+    
+    def _image_content_key(self, image_path):
+        """返回图片内容的SHA-256作为缓存键，文件无法读取时返回None"""
+        try:
+            return hashlib.sha256(image_path.read_bytes()).hexdigest()
+        except OSError as e:
+            print(f"   ❌ 读取图片失败 {image_path.name}: {e}")
             return None
     
+    def _analyze_images_cached(self, image_paths):
+        """按图片内容哈希查询分析缓存，只把未缓存的图片交给Gemini分析，返回与image_paths顺序对应的结果"""
+        keys = [self._image_content_key(image_path) for image_path in image_paths]
+        with self._gemini_cache_lock:
+            analyses = [self._gemini_cache.get(key) if key else None for key in keys]
+        
+        # 无法读取的图片直接记为失败，不影响同批的其他图片
+        pending = [i for i, (key, analysis) in enumerate(zip(keys, analyses)) if key and analysis is None]
+        cached_count = sum(1 for analysis in analyses if analysis is not None)
+        if cached_count:
+            print(f"   💾 {cached_count} 张图片使用缓存的AI分析结果")
+        if pending:
+            new_analyses = self.analyze_images_with_gemini([image_paths[i] for i in pending])
+            with self._gemini_cache_lock:
+                for i, analysis in zip(pending, new_analyses):
+                    analyses[i] = analysis
+                    if analysis:
+                        self._gemini_cache[keys[i]] = analysis
+        return analyses
+    
+    def _analyze_gemini_batch(self, image_paths):
+        """在工作线程中分析一批图片并解析响应，返回每张图片的 (分析数据, 失败原因)"""
+        results = []
+        for gemini_analysis in self._analyze_images_cached(image_paths):
+            if not gemini_analysis:
+                results.append((None, "Gemini Vision AI分析失败"))
+                continue
+            try:
+                analysis_data = self._parse_gemini_analysis(gemini_analysis)
+            except json.JSONDecodeError as e:
+                results.append((None, f"AI响应JSON解析失败: {e}"))
+                continue
+            if analysis_data is None:
+                results.append((None, "AI响应格式错误，无法解析JSON"))
+            else:
+                results.append((analysis_data, None))
+        return results
+    
     def smart_rename_with_gemini(self):
         """使用 Gemini Vision API 智能重命名图片文件 - 纯AI模式"""
         print("\n" + "=" * 60)
@@ -995,10 +1893,7 @@ class ImageDownloader:
             return
         
         # 获取所有图片文件
-        image_files = []
-        for ext in ['jpg', 'jpeg', 'png', 'webp', 'svg']:
-            image_files.extend(self.images_dir.glob(f"*.{ext}"))
-            image_files.extend(self.images_dir.glob(f"*.{ext.upper()}"))
+        image_files = self._scan_image_files(extensions=_GEMINI_IMAGE_EXTENSIONS)
         
         if not image_files:
             print("📂 未找到需要重命名的图片文件")
@@ -1011,80 +1906,91 @@ class ImageDownloader:
         successful_analyses = []
         failed_analyses = []
         
-        # 逐个分析图片
-        for i, image_path in enumerate(image_files, 1):
-            print(f"\n🔍 [{i}/{len(image_files)}] 分析: {image_path.name}")
-            file_size = image_path.stat().st_size
-            print(f"   文件大小: {self.format_file_size(file_size)}")
-            
-            # 使用 Gemini Vision 分析
-            gemini_analysis = self.analyze_image_with_gemini(image_path)
-            
-            if gemini_analysis:
-                try:
-                    # 尝试解析JSON响应
-                    import json
-                    text = gemini_analysis.strip()
-                    start = text.find('{')
-                    end = text.rfind('}') + 1
-                    if start >= 0 and end > start:
-                        json_str = text[start:end]
-                        analysis_data = json.loads(json_str)
-                        
-                        print(f"   🎯 AI识别类型: {analysis_data.get('type', '未知')}")
-                        print(f"   📋 AI识别内容: {analysis_data.get('content', '未知')}")  
-                        print(f"   🏆 置信度: {analysis_data.get('confidence', 0)}/10")
-                        
-                        # 根据AI分析生成新文件名
-                        new_filename = self.generate_ai_filename(image_path, analysis_data)
-                        if new_filename and new_filename != image_path.name:
-                            successful_analyses.append({
-                                'old_path': image_path,
-                                'new_filename': new_filename,
-                                'analysis': analysis_data
-                            })
-                            print(f"   ✅ AI推荐文件名: {new_filename}")
-                        else:
-                            print(f"   ⚠️  AI分析完成但无需重命名")
-                            failed_analyses.append(image_path.name)
-                    else:
-                        print(f"   ❌ AI响应格式错误，无法解析JSON")
-                        failed_analyses.append(image_path.name)
-                        
-                except json.JSONDecodeError as e:
-                    print(f"   ❌ AI响应JSON解析失败: {e}")
+        # 并发调用Gemini分析并在工作线程中解析响应，结果仍按文件顺序处理，重命名留在主线程中串行执行
+        max_workers = self.gemini_max_concurrent_requests
+        # 每次请求携带的图片数，大于1时多张图片合并为一次API调用
+        batch_size = self.gemini_batch_size
+        print(f"⚡ 并发分析数: {max_workers}，每批图片数: {batch_size}")
+        self._gemini_cache = self._load_gemini_cache()
+        image_paths = [image_path for image_path, _ in image_files]
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = [executor.submit(self._analyze_gemini_batch, image_paths[i:i + batch_size])
+                   for i in range(0, len(image_paths), batch_size)]
+        # 按顺序逐批等待结果，后续批次的分析仍在后台进行
+        analyses = (analysis for future in futures for analysis in future.result())
+        try:
+            for i, ((image_path, file_size), (analysis_data, error)) in enumerate(zip(image_files, analyses), 1):
+                print(f"\n🔍 [{i}/{len(image_files)}] 分析: {image_path.name}")
+                print(f"   文件大小: {self.format_file_size(file_size)}")
+                
+                if analysis_data is None:
+                    print(f"   ❌ {error}")
                     failed_analyses.append(image_path.name)
-            else:
-                print(f"   ❌ Gemini Vision AI分析失败")
-                failed_analyses.append(image_path.name)
+                    continue
+                
+                print(f"   🎯 AI识别类型: {analysis_data.get('type', '未知')}")
+                print(f"   📋 AI识别内容: {analysis_data.get('content', '未知')}")  
+                print(f"   🏆 置信度: {analysis_data.get('confidence', 0)}/10")
+                
+                # 根据AI分析生成新文件名
+                new_filename = self.generate_ai_filename(image_path, analysis_data)
+                if new_filename and new_filename != image_path.name:
+                    successful_analyses.append({
+                        'old_path': image_path,
+                        'new_filename': new_filename,
+                        'analysis': analysis_data
+                    })
+                    print(f"   ✅ AI推荐文件名: {new_filename}")
+                else:
+                    print(f"   ⚠️  AI分析完成但无需重命名")
+                    failed_analyses.append(image_path.name)
+        except GeminiLocationError:
+            print("\n🛑 由于地理位置限制，批量处理将终止")
+            return
+        finally:
+            # 中途退出（如地理位置限制）时取消尚未开始的分析任务
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+            # 中途退出时也保存已完成的分析结果，下次运行可直接复用
+            self._save_gemini_cache()
         
         # 执行重命名操作
         if successful_analyses:
             print(f"\n📝 准备重命名 {len(successful_analyses)} 个AI分析成功的文件...")
             renamed_count = 0
+            # 记录每个目标文件名下一个待尝试的序号，同名较多时不必每次从1开始逐个探测
+            next_counters = {}
+            # 只读取一次目录中的文件名，冲突检查在内存集合中完成，重命名后同步更新
+            with os.scandir(self.images_dir) as entries:
+                used_names = {entry.name for entry in entries}
             
             for item in successful_analyses:
                 old_path = item['old_path']
                 new_filename = item['new_filename']
-                new_path = old_path.parent / new_filename
                 
                 try:
                     # 避免文件名冲突
-                    if new_path.exists() and new_path != old_path:
+                    if new_filename in used_names and new_filename != old_path.name:
+                        target_filename = new_filename
                         base, ext = new_filename.rsplit('.', 1)
-                        counter = 1
-                        while new_path.exists():
+                        counter = next_counters.get(target_filename, 1)
+                        while new_filename in used_names:
                             new_filename = f"{base}_{counter:02d}.{ext}"
-                            new_path = old_path.parent / new_filename
                             counter += 1
+                        next_counters[target_filename] = counter
                     
-                    old_path.rename(new_path)
+                    old_path.rename(old_path.parent / new_filename)
+                    self._move_download_cache_entry(old_path.name, new_filename)
+                    used_names.discard(old_path.name)
+                    used_names.add(new_filename)
                     print(f"   ✅ {old_path.name} → {new_filename}")
                     renamed_count += 1
                     
                 except Exception as e:
                     print(f"   ❌ 重命名失败 {old_path.name}: {e}")
             
+            self._save_download_cache()
             print(f"\n🎉 Gemini Vision AI 智能重命名完成!")
             print(f"✅ 成功重命名: {renamed_count} 个文件") 
             print(f"❌ 分析失败: {len(failed_analyses)} 个文件")
@@ -1119,8 +2025,7 @@ class ImageDownloader:
                 # 如果confidence是字符串类型，尝试提取数字
                 confidence = 0
                 if isinstance(confidence_raw, str):
-                    import re
-                    match = re.search(r'(\d+)', confidence_raw)
+                    match = _DIGITS_RE.search(confidence_raw)
                     if match:
                         confidence = float(match.group(1))
             
@@ -1193,86 +2098,17 @@ class ImageDownloader:
         clean = clean.replace('/', '_').replace('-', '_').replace(' ', '_')
         clean = clean.replace('系列', '').replace('series', '')
         
-        # 完整的中文到英文翻译映射
-        translations = {
-            # 产品系列相关
-            '飞行员表': 'pilot',
-            '飞行': 'flight',
-            '陀飞轮': 'tourbillon',
-            '潜水表': 'dive',
-            '潜水': 'dive', 
-            '海洋': 'ocean',
-            '复古': 'retro',
-            '电视': 'tv',
-            '女表': 'women',
-            '女士': 'women',
-            '男表': 'men',
-            '男士': 'men',
-            '大师': 'master',
-            '工匠': 'craftsman',
-            '机械': 'mechanical',
-            '自动': 'automatic',
-            '石英': 'quartz',
-            
-            # 图片类型相关
-            '团队': 'team',
-            '新闻': 'news',
-            '背景': 'background',
-            '主图': 'main',
-            '缩略图': 'thumb',
-            '细节': 'detail',
-            '产品': 'product',
-            '英雄': 'hero',
-            '横幅': 'banner',
-            '图标': 'icon',
-            
-            # 质量和描述相关
-            '高清': 'hd',
-            '精美': 'fine',
-            '优质': 'quality',
-            '专业': 'professional',
-            '商务': 'business',
-            '运动': 'sport',
-            '休闲': 'casual',
-            '正装': 'formal',
-            '时尚': 'fashion',
-            '经典': 'classic',
-            '现代': 'modern',
-            '传统': 'traditional',
-            
-            # 材质相关
-            '精钢': 'steel',
-            '不锈钢': 'steel',
-            '黄金': 'gold',
-            '玫瑰金': 'rosegold',
-            '白金': 'platinum',
-            '钛合金': 'titanium',
-            '陶瓷': 'ceramic',
-            '皮革': 'leather',
-            '橡胶': 'rubber',
-            
-            # 常见词汇清理
-            '手表': 'watch',
-            '腕表': 'watch',
-            '时计': 'timepiece',
-            '表': '',  # 单独的"表"字移除
-            '款': '',  # "款"字移除
-            '型': '',  # "型"字移除
-            '级': '',  # "级"字移除
-        }
-        
         # 执行翻译
-        for chinese, english in translations.items():
-            clean = clean.replace(chinese, english)
+        clean = _FIELD_TRANSLATION_RE.sub(lambda m: _FIELD_TRANSLATIONS[m.group(0)], clean)
         
         # 移除多余的下划线和空值
-        clean = re.sub(r'_+', '_', clean).strip('_')
+        clean = _UNDERSCORES_RE.sub('_', clean).strip('_')
         
         # 移除任何剩余的中文字符
-        clean = re.sub(r'[\u4e00-\u9fff]+', '', clean)
+        clean = _CHINESE_RE.sub('', clean)
         
         # 最终清理
-        clean = re.sub(r'_+', '_', clean).strip('_')
+        clean = _UNDERSCORES_RE.sub('_', clean).strip('_')
         
         return clean
     
@@ -1281,111 +2117,27 @@ class ImageDownloader:
         if not description:
             return ""
         
-        # 中文到英文的翻译映射
-        chinese_translations = {
-            '手表': 'watch',
-            '腕表': 'watch', 
-            '时计': 'timepiece',
-            '机芯': 'movement',
-            '表盘': 'dial',
-            '表带': 'strap',
-            '表链': 'bracelet',
-            '表冠': 'crown',
-            '指针': 'hands',
-            '刻度': 'marker',
-            '夜光': 'luminous',
-            '防水': 'waterproof',
-            '计时': 'chrono',
-            '日历': 'calendar',
-            '月相': 'moonphase',
-            '动力': 'power',
-            '储能': 'reserve',
-            '精钢': 'steel',
-            '黄金': 'gold',
-            '玫瑰金': 'rosegold',
-            '钛合金': 'titanium',
-            '陶瓷': 'ceramic',
-            '蓝宝石': 'sapphire',
-            '皮革': 'leather',
-            '橡胶': 'rubber',
-            '尼龙': 'nylon',
-            '男士': 'men',
-            '女士': 'women',
-            '运动': 'sport',
-            '商务': 'business',
-            '休闲': 'casual',
-            '正装': 'formal',
-            '复古': 'vintage',
-            '现代': 'modern',
-            '经典': 'classic',
-            '时尚': 'fashion',
-            '优雅': 'elegant',
-            '精致': 'refined',
-            '豪华': 'luxury',
-            '限量': 'limited',
-            '特别': 'special',
-            '纪念': 'commemorative'
-        }
-        
-        # 优先级关键词映射（按重要性排序）
-        priority_keywords = {
-            # 高优先级 - 产品特征
-            'tourbillon': 'tourbillon',
-            'skeleton': 'skeleton', 
-            'chronograph': 'chrono',
-            'diving': 'dive',
-            'pilot': 'pilot',
-            'aviation': 'aviation',
-            'military': 'military',
-            'dress': 'dress',
-            'sport': 'sport',
-            
-            # 中优先级 - 材质和功能
-            'gold': 'gold',
-            'steel': 'steel',
-            'titanium': 'titanium',
-            'ceramic': 'ceramic',
-            'automatic': 'auto',
-            'mechanical': 'mech',
-            'quartz': 'quartz',
-            'solar': 'solar',
-            
-            # 低优先级 - 颜色和基本描述
-            'black': 'black',
-            'white': 'white', 
-            'blue': 'blue',
-            'brown': 'brown',
-            'silver': 'silver',
-            'rose': 'rose'
-        }
-        
         desc_lower = description.lower()
         
         # 首先翻译中文
-        for chinese, english in chinese_translations.items():
-            if chinese in desc_lower:
-                desc_lower = desc_lower.replace(chinese, english)
+        desc_lower = _DESCRIPTION_TRANSLATION_RE.sub(lambda m: _DESCRIPTION_TRANSLATIONS[m.group(0)], desc_lower)
         
         # 按优先级查找关键词
-        for keyword, short in priority_keywords.items():
+        for keyword, short in _PRIORITY_KEYWORDS.items():
             if keyword in desc_lower:
                 return short
         
         # 如果没找到优先关键词，查找第一个有意义的英文单词
-        words = re.findall(r'\b[a-zA-Z]{4,}\b', desc_lower)
+        words = _WORD4_RE.findall(desc_lower)
         if words:
             # 过滤掉常见无意义词汇
-            filtered_words = [w for w in words if w not in [
-                'this', 'that', 'with', 'from', 'have', 'been', 'they', 'were',
-                'said', 'each', 'which', 'their', 'time', 'will', 'about', 'image',
-                'picture', 'photo', 'showing', 'display', 'featuring', 'contains'
-            ]]
+            filtered_words = [w for w in words if w not in _DESCRIPTION_STOPWORDS]
             if filtered_words:
                 return filtered_words[0].lower()
         
         # 最后尝试提取3字母单词
-        words_3 = re.findall(r'\b[a-zA-Z]{3}\b', desc_lower)
-        useful_3_words = [w for w in words_3 if w not in ['the', 'and', 'for', 'are', 'you', 'all', 'any', 'can', 'had', 'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'its', 'may', 'new', 'now', 'old', 'see', 'two', 'way', 'who', 'boy', 'did', 'end', 'few', 'man', 'men', 'put', 'say', 'she', 'too', 'use']]
+        words_3 = _WORD3_RE.findall(desc_lower)
+        useful_3_words = [w for w in words_3 if w not in _DESCRIPTION_STOPWORDS_3]
         if useful_3_words:
             return useful_3_words[0].lower()
         
@@ -1403,23 +2155,10 @@ class ImageDownloader:
         clean = clean.replace(' ', '_').replace('/', '_').replace('-', '_')
         
         # 移除多余的下划线
-        clean = re.sub(r'_+', '_', clean).strip('_')
+        clean = _UNDERSCORES_RE.sub('_', clean).strip('_')
         
         # 翻译常见的中文系列名
-        translations = {
-            '飞行': 'flight',
-            '陀飞轮': 'tourbillon', 
-            '潜水': 'dive',
-            '海洋': 'ocean',
-            '复古': 'retro',
-            '电视': 'tv',
-            '女表': 'women',
-            '大师': 'master',
-            '工匠': 'craftsman'
-        }
-        
-        for chinese, english in translations.items():
-            clean = clean.replace(chinese, english)
+        clean = _SERIES_TRANSLATION_RE.sub(lambda m: _SERIES_TRANSLATIONS[m.group(0)], clean)
         
         return clean.lower()
     
@@ -1508,8 +2247,7 @@ class ImageDownloader:
             return 'thumb'
         elif any(word in text for word in ['01', '02', '03', '04', '05']):
             # 提取数字系列
-            import re
-            numbers = re.findall(r'\d{2}', text)
+            numbers = _TWO_DIGITS_RE.findall(text)
             if numbers:
                 return numbers[0]
             return '01'
@@ -1525,11 +2263,10 @@ class ImageDownloader:
         clean = str(part).lower().strip()
         
         # 移除所有非英文字母数字字符，只保留字母数字和连字符
-        import re
-        clean = re.sub(r'[^a-z0-9\-]', '', clean)
+        clean = _NON_FILENAME_CHARS_RE.sub('', clean)
         
         # 移除多余的连字符
-        clean = re.sub(r'-+', '-', clean).strip('-')
+        clean = _HYPHENS_RE.sub('-', clean).strip('-')
         
         # 限制长度
         if len(clean) > 15:
@@ -1538,6 +2275,28 @@ class ImageDownloader:
         return clean
 
 
+def _run_matching_mode(downloader):
+    """强制使用匹配模式"""
+    downloader.force_matching_mode = True
+    downloader.search_and_download_images()
+
+
+def _run_download_all_mode(downloader):
+    """强制使用全量下载模式"""
+    downloader.force_download_all = True
+    downloader.search_and_download_images()
+
+
+# 命令行参数到运行模式的映射
+MODE_HANDLERS = {
+    '--manual': ImageDownloader.manual_download_mode,    # 手动模式，显示所有图片供选择
+    '--match': _run_matching_mode,                        # 智能匹配模式
+    '--all': _run_download_all_mode,                      # 全量下载模式
+    '--rename': ImageDownloader.smart_rename_images,      # 只执行智能重命名
+    '--gemini': ImageDownloader.smart_rename_with_gemini, # 使用 Gemini Vision 智能重命名
+}
+
+
 def main():
     """主函数"""
     print("🖼️ Image-tools 通用图片下载器")
@@ -1545,35 +2304,21 @@ def main():
     
     downloader = ImageDownloader()
     
-    # 检查命令行参数
-    if len(sys.argv) > 1:
-        if sys.argv[1] == '--manual':
-            downloader.manual_download_mode()
-        elif sys.argv[1] == '--match':
-            # 强制使用匹配模式
-            downloader.force_matching_mode = True
-            downloader.search_and_download_images()
-        elif sys.argv[1] == '--all':
-            # 强制使用全量下载模式
-            downloader.force_download_all = True
-            downloader.search_and_download_images()
-        elif sys.argv[1] == '--rename':
-            # 只执行智能重命名
-            downloader.smart_rename_images()
-        elif sys.argv[1] == '--gemini':
-            # 使用 Gemini Vision 智能重命名
-            downloader.smart_rename_with_gemini()
-        else:
-            print("❌ 未知参数。可用参数:")
-            print("   --manual : 手动模式，显示所有图片供选择")
-            print("   --match  : 智能匹配模式")
-            print("   --all    : 全量下载模式")
-            print("   --rename : 智能重命名模式")
-            print("   --gemini : Gemini Vision 智能重命名模式")
+    # 检查命令行参数，默认使用全量下载模式
+    mode = sys.argv[1] if len(sys.argv) > 1 else '--all'
+    handler = MODE_HANDLERS.get(mode)
+    if handler:
+        handler(downloader)
     else:
-        # 默认使用全量下载模式
-        downloader.force_download_all = True
-        downloader.search_and_download_images()
+        print("❌ 未知参数。可用参数:")
+        print("   --manual : 手动模式，显示所有图片供选择")
+        print("   --match  : 智能匹配模式")
+        print("   --all    : 全量下载模式")
+        print("   --rename : 智能重命名模式")
+        print("   --gemini : Gemini Vision 智能重命名模式")
+        print("   附加 --refresh 可忽略图片URL缓存，重新抓取页面")
+        print("   附加 --no-cache 可禁用网页HTML缓存")
+        print("   附加 --force 可重新下载images目录中已存在的图片")
 
 
 if __name__ == '__main__':
@@ -13,6 +13,13 @@ if %errorlevel% neq 0 (
     exit /b 1
 )
 
+REM 依赖已齐全时跳过pip，避免每次启动都解析一遍依赖
+python check_requirements.py >nul 2>&1
+if %errorlevel% equ 0 (
+    echo ✅ 依赖包已安装，跳过安装步骤
+    goto run
+)
+
 echo 📦 正在安装依赖包...
 pip install -r requirements.txt
 if %errorlevel% neq 0 (
@@ -21,6 +28,8 @@ if %errorlevel% neq 0 (
     exit /b 1
 )
 
+:run
+
 echo.
 echo 🚀 开始运行图片下载器...
 echo.
@@ -62,8 +62,13 @@ if [ "$1" = "gemini" ]; then
     fi
 fi
 
-echo "📦 正在安装依赖包..."
-pip install -r requirements.txt 2>/dev/null || pip3 install -r requirements.txt 2>/dev/null || echo "依赖包安装可能失败，继续运行..."
+# 依赖已齐全时跳过pip，避免每次启动都解析一遍依赖
+if python3 check_requirements.py 2>/dev/null; then
+    echo "✅ 依赖包已安装，跳过安装步骤"
+else
+    echo "📦 正在安装依赖包..."
+    pip install -r requirements.txt 2>/dev/null || pip3 install -r requirements.txt 2>/dev/null || echo "依赖包安装可能失败，继续运行..."
+fi
 
 echo ""
 # 创建images目录（如果不存在）